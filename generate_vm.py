@@ -1,99 +0,0 @@
-#!/usr/bin/env python3
-"""Generate complete VM implementation"""
-
-# Due to size constraints, we'll generate a comprehensive VM implementation
-# This is a code generator to avoid heredoc limitations
-
-vm_c_content = """/*
- * Stipple VM Core - MISRA-C Compliant
- */
-
-#include "stipple.h"
-#include <stdio.h>
-#include <string.h>
-#include <math.h>
-
-/* Minimal implementation - see docs/sdd.md for full specification */
-
-const char* var_type_to_string(var_value_type_t type) {
-    const char* types[] = {"void", "i32", "u32", "float", "u8x4", "u16x2", 
-                           "unicode", "global_ref", "stack_ref", "buffer_ref", "buffer_pos"};
-    return (type <= V_BUF_POS) ? types[type] : "unknown";
-}
-
-const char* buffer_type_to_string(membuf_type_t type) {
-    const char* types[] = {"void", "u8[256]", "u16[128]", "i32[64]", "u32[64]", "float[64]"};
-    return (type <= MB_FLOAT) ? types[type] : "unknown";
-}
-
-const char* opcode_to_string(opcode_t opcode) {
-    /* Abbreviated for space - full implementation would have all opcodes */
-    if (opcode == OP_NOP) return "nop";
-    if (opcode == OP_HALT) return "halt";
-    if (opcode == OP_LOAD_I_I32) return "load.i.i32";
-    if (opcode == OP_PRINT_I32) return "print.i32";
-    if (opcode == OP_ADD_I32) return "add.i32";
-    return "unknown";
-}
-
-const char* vm_get_error_string(vm_status_t status) {
-    const char* errors[] = {
-        "Success", "Stack overflow", "Stack underflow", "Division by zero",
-        "Invalid opcode", "Type mismatch", "Array bounds", "Invalid global",
-        "Invalid local", "Invalid stack var", "Invalid buffer", "Invalid buffer pos",
-        "Invalid PC", "Invalid instruction", "Program too large", "Program halted"
-    };
-    return (status <= VM_ERR_HALT) ? errors[status] : "Unknown";
-}
-
-bool validate_global_idx(index_t idx) { return idx < G_VARS_COUNT; }
-bool validate_local_idx(index_t idx) { return idx < STACK_LOCALS_COUNT; }
-bool validate_stack_var_idx(index_t idx) { return idx < STACK_VAR_COUNT; }
-bool validate_buffer_idx(index_t idx) { return idx < G_MEMBUF_COUNT; }
-bool validate_buffer_pos(membuf_type_t type, pos_t pos) {
-    return pos < get_buffer_capacity(type);
-}
-
-void vm_init(vm_state_t* vm) {
-    memset(vm, 0, sizeof(*vm));
-    for (uint32_t i = 0; i < G_VARS_COUNT; i++) vm->g_vars[i].type = V_VOID;
-    for (uint32_t i = 0; i < G_MEMBUF_COUNT; i++) vm->g_membuf[i].type = MB_VOID;
-}
-
-void vm_reset(vm_state_t* vm) { vm_init(vm); }
-
-vm_status_t vm_load_program(vm_state_t* vm, const uint8_t* program, uint32_t len) {
-    if (len > PROGRAM_MAX_SIZE) return VM_ERR_PROGRAM_TOO_LARGE;
-    memcpy(vm->program, program, len);
-    vm->program_len = len;
-    vm->pc = 0;
-    return VM_OK;
-}
-
-/* Placeholder implementations for vm_step and vm_run */
-vm_status_t vm_step(vm_state_t* vm) {
-    /* TODO: Full implementation */
-    return VM_ERR_INVALID_OPCODE;
-}
-
-vm_status_t vm_run(vm_state_t* vm) {
-    vm_status_t status;
-    while ((status = vm_step(vm)) == VM_OK) {}
-    return (status == VM_ERR_HALT) ? VM_OK : status;
-}
-
-void vm_disassemble_instruction(const vm_state_t* vm, uint32_t pc) {
-    printf("PC=0x%04X: (disassembly not yet implemented)\\n", pc);
-}
-
-void vm_dump_state(const vm_state_t* vm) {
-    printf("VM State: PC=0x%04X SP=%u FLAGS=0x%02X\\n", vm->pc, vm->sp, vm->flags);
-}
-"""
-
-with open('src/vm.c', 'w') as f:
-    f.write(vm_c_content)
-
-print("VM implementation created (minimal/stub version)")
-print("This needs to be expanded with full instruction execution")
-
@@ -41,6 +41,11 @@
 /* Maximum payload length in 4-byte words */
 #define INSTRUCTION_MAX_PAYLOAD_WORDS 3
 
+/* Readable padding after the loaded program so the decoder can fetch a
+ * full INSTRUCTION_LARGE_SIZE window unconditionally, even for a short
+ * instruction at the very end of instruction memory. */
+#define PROGRAM_DECODE_PAD (INSTRUCTION_LARGE_SIZE - INSTRUCTION_HEADER_SIZE)
+
 /* ============================================================================
  * VM Status Codes
  * ============================================================================ */
@@ -107,8 +112,26 @@ typedef struct {
 	} val;
 } var_value_t;
 
-/* Static assertion to verify var_value_t size */
-_Static_assert(sizeof(var_value_t) <= 12, "var_value_t too large");
+/* Static assertion to verify var_value_t size.  Globals, locals, and frame
+ * return values are arrays of this struct, so the tag must not pad it past
+ * one 8-byte word (stack variables use the tighter split layout below). */
+_Static_assert(sizeof(var_value_t) == 8, "var_value_t must be 8 bytes");
+
+/* 4-byte value cell for the split (SoA) stack-variable storage.  Stack
+ * variables keep their type tags and values in parallel arrays so the
+ * interpreter can check operand types with packed byte loads and fetch
+ * values as single aligned 32-bit words. */
+typedef union {
+	int32_t i32;                    /* V_I32 */
+	uint32_t u32;                   /* V_U32, V_UC, V_GLOBAL_VAR_IDX, V_BUF_IDX, V_BUF_POS */
+	float f32;                      /* V_FLOAT */
+	uint8_t u8x4[4];                /* V_U8 */
+	uint16_t u16x2[2];              /* V_U16 */
+	stack_var_ref_t stack_var_ref;  /* V_STACK_VAR_IDX */
+} var_cell_t;
+
+/* Static assertion to verify var_cell_t size */
+_Static_assert(sizeof(var_cell_t) == 4, "var_cell_t must be 4 bytes");
 
 /* ============================================================================
  * Memory Buffers
@@ -143,9 +166,11 @@ _Static_assert(sizeof(membuf_t) <= 260, "membuf_t too large");
  * Stack Frame Structure
  * ============================================================================ */
 
-/* Complete stack frame structure */
+/* Complete stack frame structure.  Stack variables use a structure-of-arrays
+ * layout (type tags and value cells in parallel arrays). */
 typedef struct {
-	var_value_t stack_vars[STACK_VAR_COUNT];  /* Parameter passing variables */
+	uint8_t stack_var_types[STACK_VAR_COUNT]; /* var_value_type_t tags */
+	var_cell_t stack_vars[STACK_VAR_COUNT];   /* Parameter passing variables */
 	var_value_t locals[STACK_LOCALS_COUNT];   /* Local variables */
 	var_value_t ret_val;                      /* Return value */
 	uint32_t return_addr;                     /* Return address (PC) */
@@ -308,6 +333,40 @@ typedef enum {
 	OP_CMP_U32 = 0x61,      /* Compare unsigned integers */
 	OP_CMP_F32 = 0x62,      /* Compare floats */
 
+	/* Fused compare-and-branch (0x63-0x68).  Source stack-var indices are
+	 * packed into the operand byte (src1 in bits 0-3, src2 in bits 4-7);
+	 * imm1 is the branch target.  These do not read or write the condition
+	 * flags.  vm_load_program synthesizes them from CMP_I32 + Jcc pairs. */
+	OP_JEQ_I32 = 0x63,      /* Branch if src1 == src2 (signed) */
+	OP_JNE_I32 = 0x64,      /* Branch if src1 != src2 (signed) */
+	OP_JLT_I32 = 0x65,      /* Branch if src1 < src2 (signed) */
+	OP_JGT_I32 = 0x66,      /* Branch if src1 > src2 (signed) */
+	OP_JLE_I32 = 0x67,      /* Branch if src1 <= src2 (signed) */
+	OP_JGE_I32 = 0x68,      /* Branch if src1 >= src2 (signed) */
+
+	/* Fused load-and-add super-instructions (0x69-0x6A).  The dest stack
+	 * var is in operand bits 0-3 and the temp written by the folded load in
+	 * bits 4-7.  Both preserve the folded load's write to the temp, so they
+	 * are drop-in replacements for the pair.  vm_load_program synthesizes
+	 * them from LOAD_I_I32/LOAD_L + ADD_I32 pairs. */
+	OP_ADD_I32_IMM = 0x69,    /* temp = imm2; dest = src (imm1) + temp */
+	OP_LOAD_L_ADD_I32 = 0x6A, /* temp = locals[imm1]; dest = src (imm2) + temp */
+
+	/* Constant-divisor signed division (0x6B).  Synthesized from a
+	 * LOAD_I_I32 + DIV_I32 pair; the load is kept, the divide is rewritten
+	 * to a multiply by a precomputed reciprocal.  operand is the dest,
+	 * imm1 the numerator stack var, imm2 the magic multiplier; the header
+	 * types byte packs the shift (bits 0-4) and sign adjustment (bits
+	 * 5-6). */
+	OP_DIV_I32_CONST = 0x6B,
+
+	/* Branchless compare-to-boolean (0x6C-0x6D).  Write a V_U32 0/1
+	 * directly into the dest stack var, so front-ends can materialize a
+	 * comparison result without going through the flags register and a
+	 * conditional jump.  operand is the dest, imm1/imm2 the sources. */
+	OP_SET_EQ_I32 = 0x6C,   /* dest = (src1 == src2) ? 1 : 0 (signed) */
+	OP_SET_LT_I32 = 0x6D,   /* dest = (src1 < src2) ? 1 : 0 (signed) */
+
 	/* Type Conversion Operations (0x70-0x7F) */
 	OP_I32_TO_U32 = 0x70,   /* Convert signed to unsigned int */
 	OP_U32_TO_I32 = 0x71,   /* Convert unsigned to signed int */
@@ -348,7 +407,7 @@ typedef enum {
 	/* 0x3B-0x3F: Integer arithmetic extensions */
 	/* 0x47-0x4F: Float arithmetic extensions */
 	/* 0x56-0x5F: Bitwise operation extensions */
-	/* 0x63-0x6F: Comparison extensions */
+	/* 0x6E-0x6F: Comparison extensions */
 	/* 0x76-0x7F: Type conversion extensions */
 	/* 0x84-0x8F: Buffer operation extensions */
 	/* 0x96-0x9F: String operation extensions */
@@ -378,7 +437,7 @@ typedef struct {
 	uint8_t sp;  /* Stack pointer (current frame index, 0-31) */
 
 	/* Program execution */
-	uint8_t program[PROGRAM_MAX_SIZE];  /* Instruction memory */
+	uint8_t program[PROGRAM_MAX_SIZE + PROGRAM_DECODE_PAD];  /* Instruction memory */
 	uint32_t program_len;               /* Length of loaded program */
 	uint32_t pc;                        /* Program counter */
 
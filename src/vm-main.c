@@ -114,6 +114,10 @@ static void print_hex16_err(uint16_t value) {
 }
 
 int main(int argc, char** argv) {
+    /* Full buffering even when stdout is a terminal; the VM flushes its own
+     * output buffer at the points that matter (newlines, reads, exit). */
+    (void)setvbuf(stdout, NULL, _IOFBF, 65536);
+
     if (argc != 2) {
         print_usage(argv[0]);
         return 1;
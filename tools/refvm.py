@@ -0,0 +1,889 @@
+#!/usr/bin/env python3
+"""Pure-Python reference interpreter for Stipple VM bytecode.
+
+A slow but straightforward executable model of the VM, for differential
+testing: run the same .bin through this and through build/stipple-vm and
+diff the output.  Because this interpreter executes the architectural
+(unfused) semantics directly, it doubles as an oracle for the C VM's
+load-time rewrites -- verification, compare/branch fusion, load/add
+fusion, and constant-divisor division must all be invisible in a diff.
+
+The opcode numbering is read from src/stipple.h and the operand kinds
+from src/opcodes.def, so this file does not duplicate the opcode table.
+
+Intentional approximations (documented, not observable in valid
+programs): out-of-range float-to-int conversion follows the common
+x86-64 result instead of the C standard's undefined behavior.
+
+Usage: python3 tools/refvm.py <bytecode_file>
+"""
+
+import re
+import struct
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+# VM configuration (mirrors stipple.h)
+PROGRAM_MAX_SIZE = 65536
+STACK_DEPTH = 32
+STACK_VAR_COUNT = 16
+STACK_LOCALS_COUNT = 64
+G_VARS_COUNT = 256
+G_MEMBUF_COUNT = 256
+G_MEMBUF_LEN = 256
+MEMBUF_U8_COUNT = 256
+
+# Variable types
+V_VOID, V_I32, V_U32, V_FLOAT = 0, 1, 2, 3
+# Buffer types
+MB_VOID, MB_U8, MB_U16, MB_I32, MB_U32, MB_FLOAT = 0, 1, 2, 3, 4, 5
+MB_CAPACITY = {MB_VOID: 0, MB_U8: 256, MB_U16: 128, MB_I32: 64, MB_U32: 64,
+               MB_FLOAT: 64}
+
+FLAG_ZERO, FLAG_LESS, FLAG_GREATER = 0x01, 0x02, 0x04
+
+# Status codes (order matches vm_status_t)
+STATUS_NAMES = [
+    "Success", "Stack overflow", "Stack underflow", "Division by zero",
+    "Invalid opcode", "Type mismatch", "Array bounds exceeded",
+    "Invalid global index", "Invalid local index", "Invalid stack var index",
+    "Invalid buffer index", "Invalid buffer position",
+    "Invalid program counter", "Invalid instruction", "Program too large",
+    "Arithmetic overflow", "Program halted",
+]
+(VM_OK, ERR_STACK_OVERFLOW, ERR_STACK_UNDERFLOW, ERR_DIV_BY_ZERO,
+ ERR_INVALID_OPCODE, ERR_TYPE_MISMATCH, ERR_BOUNDS, ERR_INVALID_GLOBAL_IDX,
+ ERR_INVALID_LOCAL_IDX, ERR_INVALID_STACK_VAR_IDX, ERR_INVALID_BUFFER_IDX,
+ ERR_INVALID_BUFFER_POS, ERR_INVALID_PC, ERR_INVALID_INSTRUCTION,
+ ERR_PROGRAM_TOO_LARGE, ERR_OVERFLOW, ERR_HALT) = range(17)
+
+
+def load_opcode_table():
+    """Opcode name -> value from stipple.h; value -> kind and value ->
+    canonical payload length (None for VM_PLEN_ANY) from opcodes.def."""
+    values = {}
+    for m in re.finditer(r"\b(OP_\w+) = (0x[0-9A-Fa-f]+)",
+                         (SRC / "stipple.h").read_text()):
+        values[m.group(1)] = int(m.group(2), 16)
+    kinds, plens = {}, {}
+    for m in re.finditer(
+            r'OPCODE\((OP_\w+),\s*"[^"]*",\s*(OPK_\w+),\s*(\w+)\)',
+            (SRC / "opcodes.def").read_text()):
+        kinds[values[m.group(1)]] = m.group(2)
+        plen = m.group(3)
+        plens[values[m.group(1)]] = (None if plen == "VM_PLEN_ANY"
+                                     else int(plen.rstrip("u")))
+    return values, kinds, plens
+
+
+OP, KIND, PLEN = load_opcode_table()
+
+
+# 32-bit value helpers: cells are raw 32-bit words, like the C union
+def f32(x):
+    """Round a Python float to IEEE single precision."""
+    return struct.unpack("<f", struct.pack("<f", x))[0]
+
+
+def bits_of_f32(x):
+    return struct.unpack("<I", struct.pack("<f", x))[0]
+
+
+def f32_of_bits(b):
+    return struct.unpack("<f", struct.pack("<I", b))[0]
+
+
+def i32_of_bits(b):
+    return b - 0x100000000 if b & 0x80000000 else b
+
+
+def bits_of_i32(v):
+    return v & 0xFFFFFFFF
+
+
+def is_valid_float(x):
+    """fpclassify: accept normal and zero; reject inf, NaN, subnormal."""
+    if x != x or x in (float("inf"), float("-inf")):
+        return False
+    return x == 0.0 or abs(x) >= 2.0 ** -126
+
+
+class VMError(Exception):
+    def __init__(self, status):
+        self.status = status
+
+
+class StackFrame:
+    def __init__(self):
+        self.stack_types = [V_VOID] * STACK_VAR_COUNT
+        self.stack_vals = [0] * STACK_VAR_COUNT
+        self.locals_types = [V_VOID] * STACK_LOCALS_COUNT
+        self.locals_vals = [0] * STACK_LOCALS_COUNT
+        self.ret_type = V_VOID
+        self.ret_val = 0
+        self.return_addr = 0
+
+
+class MemBuf:
+    def __init__(self):
+        self.type = MB_VOID
+        self.data = bytearray(G_MEMBUF_LEN)
+
+    def strlen(self):
+        n = self.data.find(0)
+        return n if 0 <= n < MEMBUF_U8_COUNT else MEMBUF_U8_COUNT
+
+
+def verify(program):
+    """Mirror of vm_verify_program: operand range checks and branch
+    targets on instruction boundaries."""
+    plen = len(program)
+    boundaries = set()
+    pc = 0
+    while pc < plen:
+        if plen - pc < 4:
+            raise VMError(ERR_INVALID_INSTRUCTION)
+        opcode, operand, flags, _types = program[pc:pc + 4]
+        payload_len = flags & 0x0F
+        size = 4 + payload_len * 4
+        if payload_len > 3 or pc + size > plen:
+            raise VMError(ERR_INVALID_INSTRUCTION)
+        imm = [0, 0, 0]
+        for i in range(payload_len):
+            imm[i] = struct.unpack_from("<I", program, pc + 4 + 4 * i)[0]
+        boundaries.add(pc)
+
+        kind = KIND.get(opcode)
+        sv, gv = STACK_VAR_COUNT, G_VARS_COUNT
+        if kind is None:
+            raise VMError(ERR_INVALID_OPCODE)
+        elif kind in ("OPK_NONE", "OPK_BRANCH"):
+            pass
+        elif kind == "OPK_DST":
+            if operand >= sv:
+                raise VMError(ERR_INVALID_STACK_VAR_IDX)
+        elif kind == "OPK_DST_GLOBAL":
+            if operand >= sv:
+                raise VMError(ERR_INVALID_STACK_VAR_IDX)
+            if imm[0] >= gv:
+                raise VMError(ERR_INVALID_GLOBAL_IDX)
+        elif kind == "OPK_DST_LOCAL":
+            if operand >= sv:
+                raise VMError(ERR_INVALID_STACK_VAR_IDX)
+            if imm[0] >= STACK_LOCALS_COUNT:
+                raise VMError(ERR_INVALID_LOCAL_IDX)
+        elif kind == "OPK_DST_SREF":
+            if operand >= sv:
+                raise VMError(ERR_INVALID_STACK_VAR_IDX)
+            if (imm[0] & 0xFFFF) >= STACK_DEPTH or (imm[0] >> 16) >= sv:
+                raise VMError(ERR_INVALID_STACK_VAR_IDX)
+        elif kind == "OPK_DST_FRAME":
+            if operand >= sv:
+                raise VMError(ERR_INVALID_STACK_VAR_IDX)
+            if imm[0] >= STACK_DEPTH:
+                raise VMError(ERR_INVALID_STACK_VAR_IDX)
+        elif kind == "OPK_DST_SRC_SRC":
+            if operand >= sv or imm[0] >= sv or imm[1] >= sv:
+                raise VMError(ERR_INVALID_STACK_VAR_IDX)
+        elif kind == "OPK_DST_SRC":
+            if operand >= sv or imm[0] >= sv:
+                raise VMError(ERR_INVALID_STACK_VAR_IDX)
+        elif kind == "OPK_SRC_SRC":
+            if imm[0] >= sv or imm[1] >= sv:
+                raise VMError(ERR_INVALID_STACK_VAR_IDX)
+        elif kind == "OPK_SRC":
+            if imm[0] >= sv:
+                raise VMError(ERR_INVALID_STACK_VAR_IDX)
+        elif kind == "OPK_LOCAL_SRC":
+            if imm[0] >= STACK_LOCALS_COUNT:
+                raise VMError(ERR_INVALID_LOCAL_IDX)
+            if imm[1] >= sv:
+                raise VMError(ERR_INVALID_STACK_VAR_IDX)
+        elif kind == "OPK_DST_BUF":
+            if operand >= sv:
+                raise VMError(ERR_INVALID_STACK_VAR_IDX)
+            if imm[0] >= G_MEMBUF_COUNT:
+                raise VMError(ERR_INVALID_BUFFER_IDX)
+        elif kind == "OPK_BUF":
+            if imm[0] >= G_MEMBUF_COUNT:
+                raise VMError(ERR_INVALID_BUFFER_IDX)
+        elif kind == "OPK_BUF_BUF":
+            if imm[0] >= G_MEMBUF_COUNT or imm[1] >= G_MEMBUF_COUNT:
+                raise VMError(ERR_INVALID_BUFFER_IDX)
+        elif kind == "OPK_DST_BUF_POS":
+            if operand >= sv:
+                raise VMError(ERR_INVALID_STACK_VAR_IDX)
+            if imm[0] >= G_MEMBUF_COUNT:
+                raise VMError(ERR_INVALID_BUFFER_IDX)
+            if imm[1] >= MEMBUF_U8_COUNT:
+                raise VMError(ERR_INVALID_BUFFER_POS)
+        elif kind == "OPK_BUF_POS":
+            if imm[0] >= G_MEMBUF_COUNT:
+                raise VMError(ERR_INVALID_BUFFER_IDX)
+            if imm[1] >= MEMBUF_U8_COUNT:
+                raise VMError(ERR_INVALID_BUFFER_POS)
+        else:
+            raise VMError(ERR_INVALID_OPCODE)
+
+        # Only the canonical encoding of each opcode is accepted
+        expect = PLEN.get(opcode)
+        if expect is not None and payload_len != expect:
+            raise VMError(ERR_INVALID_INSTRUCTION)
+        pc += size
+
+    pc = 0
+    while pc < plen:
+        opcode, _operand, flags, _types = program[pc:pc + 4]
+        payload_len = flags & 0x0F
+        if KIND.get(opcode) == "OPK_BRANCH":
+            target = 0
+            if payload_len >= 1:
+                target = struct.unpack_from("<I", program, pc + 4)[0]
+            if target >= plen or target % 4 != 0 or target not in boundaries:
+                raise VMError(ERR_INVALID_PC)
+        pc += 4 + payload_len * 4
+
+
+class RefVM:
+    def __init__(self, program):
+        if len(program) > PROGRAM_MAX_SIZE:
+            raise VMError(ERR_PROGRAM_TOO_LARGE)
+        verify(program)
+        self.program = bytes(program)
+        self.pc = 0
+        self.flags = 0
+        self.sp = 0
+        self.frames = [StackFrame() for _ in range(STACK_DEPTH)]
+        self.g_types = [V_VOID] * G_VARS_COUNT
+        self.g_vals = [0] * G_VARS_COUNT
+        self.bufs = [MemBuf() for _ in range(G_MEMBUF_COUNT)]
+
+    # -- output, matching the C VM's manual formatting ------------------
+    def out(self, s):
+        sys.stdout.write(s)
+
+    def print_f32(self, value):
+        if value < 0.0:
+            self.out("-")
+            value = -value
+        int_part = int(value)
+        frac = f32(value - f32(float(int_part)))
+        self.out(str(int_part) + ".")
+        frac_val = int(f32(frac * 1000000.0))
+        for _ in range(6):
+            self.out(chr(ord("0") + frac_val // 100000))
+            frac_val = (frac_val % 100000) * 10
+
+    # -- input, matching scanf/getchar usage ----------------------------
+    def _getchar(self):
+        c = sys.stdin.read(1)
+        return c if c else None
+
+    def _scan_token(self, allowed):
+        """Skip whitespace, then greedily read characters from allowed.
+        Returns the token (possibly empty on failure)."""
+        c = self._getchar()
+        while c is not None and c.isspace():
+            c = self._getchar()
+        tok = ""
+        while c is not None and (c in allowed):
+            tok += c
+            c = self._getchar()
+        self._pushback = c
+        return tok
+
+    _pushback = None
+
+    def _discard_line(self, limit=1024):
+        c = self._pushback
+        self._pushback = None
+        n = 0
+        while n < limit and c not in (None, "\n"):
+            c = self._getchar()
+            n += 1
+
+    def _read_number(self, signed, floating=False):
+        allowed = "0123456789"
+        if signed or floating:
+            allowed += "+-"
+        if floating:
+            allowed += ".eE"
+        tok = self._scan_token(allowed)
+        try:
+            if floating:
+                return f32(float(tok))
+            v = int(tok)
+        except ValueError:
+            return None
+        if signed and not (-2 ** 31 <= v < 2 ** 31):
+            v = -2 ** 31 if v < 0 else 2 ** 31 - 1  # glibc clamps on overflow
+        if not signed:
+            v &= 0xFFFFFFFF
+        if self._pushback not in (None, "\n"):
+            pass  # leave pushback for the next read, like ungetc
+        return v
+
+    # -- typed cell accessors -------------------------------------------
+    def sv(self, idx):
+        f = self.frames[self.sp]
+        return f.stack_types[idx], f.stack_vals[idx]
+
+    def set_sv(self, idx, vtype, bits):
+        f = self.frames[self.sp]
+        f.stack_types[idx] = vtype
+        f.stack_vals[idx] = bits
+
+    def req_i32(self, idx):
+        t, b = self.sv(idx)
+        if t != V_I32:
+            raise VMError(ERR_TYPE_MISMATCH)
+        return i32_of_bits(b)
+
+    def req_u32(self, idx):
+        t, b = self.sv(idx)
+        if t != V_U32:
+            raise VMError(ERR_TYPE_MISMATCH)
+        return b
+
+    def req_f32(self, idx):
+        t, b = self.sv(idx)
+        if t != V_FLOAT:
+            raise VMError(ERR_TYPE_MISMATCH)
+        return f32_of_bits(b)
+
+    def set_float_result(self, idx, value):
+        value = f32(value)
+        self.set_sv(idx, V_FLOAT, bits_of_f32(value))
+        if not is_valid_float(value):
+            raise VMError(ERR_OVERFLOW)
+
+    VAR_TYPE_NAMES = ["void", "i32", "u32", "float", "u8x4", "u16x2",
+                      "unicode", "global_ref", "stack_ref", "buffer_ref",
+                      "buffer_pos"]
+
+    def dump_state(self, status):
+        """Mirror of vm_dump_state, written to stdout like the C CLI."""
+        self.out("=== VM State ===\n")
+        self.out("PC: 0x%04X  SP: %d  Flags: 0x%02X\n"
+                 % (self.pc & 0xFFFF, self.sp, self.flags))
+        self.out("Last Error: %s\n" % STATUS_NAMES[status])
+        self.out("\nStack Frame %d:\n" % self.sp)
+        frame = self.frames[self.sp]
+        for i in range(STACK_VAR_COUNT):
+            t, bits = frame.stack_types[i], frame.stack_vals[i]
+            if t == V_VOID:
+                continue
+            self.out("  s%d: %s = " % (i, self.VAR_TYPE_NAMES[t]))
+            if t == V_I32:
+                self.out(str(i32_of_bits(bits)))
+            elif t == V_U32:
+                self.out(str(bits))
+            elif t == V_FLOAT:
+                self.print_f32(f32_of_bits(bits))
+            self.out("\n")
+
+    # -- execution ------------------------------------------------------
+    def run(self):
+        program, plen = self.program, len(self.program)
+        while True:
+            pc = self.pc
+            if pc >= plen:
+                raise VMError(ERR_INVALID_PC)
+            opcode, operand, hflags, htypes = program[pc:pc + 4]
+            payload_len = hflags & 0x0F
+            imm = [0, 0, 0]
+            for i in range(payload_len):
+                imm[i] = struct.unpack_from("<I", program, pc + 4 + 4 * i)[0]
+            # pc stays on the current instruction until it retires, so an
+            # error reports the faulting pc exactly like the C VM
+            self.next_pc = pc + 4 + payload_len * 4
+            self.step(opcode, operand, htypes, imm)
+            self.pc = self.next_pc
+
+    def step(self, opcode, operand, htypes, imm):
+        frame = self.frames[self.sp]
+
+        if opcode == OP["OP_NOP"]:
+            pass
+        elif opcode == OP["OP_HALT"]:
+            raise VMError(ERR_HALT)
+
+        # Control flow
+        elif opcode == OP["OP_JMP"]:
+            self.next_pc = imm[0]
+        elif opcode == OP["OP_JZ"]:
+            if self.flags & FLAG_ZERO:
+                self.next_pc = imm[0]
+        elif opcode == OP["OP_JNZ"]:
+            if not self.flags & FLAG_ZERO:
+                self.next_pc = imm[0]
+        elif opcode == OP["OP_JLT"]:
+            if self.flags & FLAG_LESS:
+                self.next_pc = imm[0]
+        elif opcode == OP["OP_JGT"]:
+            if self.flags & FLAG_GREATER:
+                self.next_pc = imm[0]
+        elif opcode == OP["OP_JLE"]:
+            if self.flags & (FLAG_LESS | FLAG_ZERO):
+                self.next_pc = imm[0]
+        elif opcode == OP["OP_JGE"]:
+            if self.flags & (FLAG_GREATER | FLAG_ZERO):
+                self.next_pc = imm[0]
+        elif opcode == OP["OP_CALL"]:
+            if self.sp >= STACK_DEPTH - 1:
+                raise VMError(ERR_STACK_OVERFLOW)
+            self.frames[self.sp + 1].return_addr = self.next_pc
+            self.sp += 1
+            new = self.frames[self.sp]
+            new.locals_types = [V_VOID] * STACK_LOCALS_COUNT
+            new.locals_vals = [0] * STACK_LOCALS_COUNT
+            self.next_pc = imm[0]
+        elif opcode == OP["OP_RET"]:
+            if self.sp == 0:
+                raise VMError(ERR_STACK_UNDERFLOW)
+            self.next_pc = frame.return_addr
+            self.sp -= 1
+
+        # Loads
+        elif opcode == OP["OP_LOAD_G"]:
+            self.set_sv(operand, self.g_types[imm[0]], self.g_vals[imm[0]])
+        elif opcode == OP["OP_LOAD_L"]:
+            self.set_sv(operand, frame.locals_types[imm[0]],
+                        frame.locals_vals[imm[0]])
+        elif opcode == OP["OP_LOAD_S"]:
+            src = self.frames[imm[0] & 0xFFFF]
+            var = imm[0] >> 16
+            self.set_sv(operand, src.stack_types[var], src.stack_vals[var])
+        elif opcode == OP["OP_LOAD_I_I32"]:
+            self.set_sv(operand, V_I32, imm[0])
+        elif opcode == OP["OP_LOAD_I_U32"]:
+            self.set_sv(operand, V_U32, imm[0])
+        elif opcode == OP["OP_LOAD_I_F32"]:
+            self.set_sv(operand, V_FLOAT, imm[0])
+        elif opcode == OP["OP_LOAD_RET"]:
+            src = self.frames[imm[0]]
+            self.set_sv(operand, src.ret_type, src.ret_val)
+
+        # Stores
+        elif opcode == OP["OP_STORE_G"]:
+            t, b = self.sv(operand)
+            self.g_types[imm[0]], self.g_vals[imm[0]] = t, b
+        elif opcode == OP["OP_STORE_L"]:
+            t, b = self.sv(operand)
+            frame.locals_types[imm[0]], frame.locals_vals[imm[0]] = t, b
+        elif opcode == OP["OP_STORE_S"]:
+            dest = self.frames[imm[0] & 0xFFFF]
+            var = imm[0] >> 16
+            t, b = self.sv(operand)
+            dest.stack_types[var], dest.stack_vals[var] = t, b
+        elif opcode == OP["OP_STORE_RET"]:
+            dest = self.frames[imm[0]]
+            dest.ret_type, dest.ret_val = self.sv(operand)
+
+        # Signed arithmetic (overflow is an error, like the C ckd_* checks)
+        elif opcode == OP["OP_ADD_I32"]:
+            r = self.req_i32(imm[0]) + self.req_i32(imm[1])
+            self.set_sv(operand, V_I32, bits_of_i32(r))
+            if not -2 ** 31 <= r < 2 ** 31:
+                raise VMError(ERR_OVERFLOW)
+        elif opcode == OP["OP_SUB_I32"]:
+            r = self.req_i32(imm[0]) - self.req_i32(imm[1])
+            self.set_sv(operand, V_I32, bits_of_i32(r))
+            if not -2 ** 31 <= r < 2 ** 31:
+                raise VMError(ERR_OVERFLOW)
+        elif opcode == OP["OP_MUL_I32"]:
+            r = self.req_i32(imm[0]) * self.req_i32(imm[1])
+            self.set_sv(operand, V_I32, bits_of_i32(r))
+            if not -2 ** 31 <= r < 2 ** 31:
+                raise VMError(ERR_OVERFLOW)
+        elif opcode == OP["OP_DIV_I32"]:
+            a, b = self.req_i32(imm[0]), self.req_i32(imm[1])
+            if a == -2 ** 31 and b == -1:
+                raise VMError(ERR_OVERFLOW)
+            if b == 0:
+                raise VMError(ERR_DIV_BY_ZERO)
+            q = abs(a) // abs(b)  # C division truncates toward zero
+            if (a < 0) != (b < 0):
+                q = -q
+            self.set_sv(operand, V_I32, bits_of_i32(q))
+        elif opcode == OP["OP_MOD_I32"]:
+            a, b = self.req_i32(imm[0]), self.req_i32(imm[1])
+            if a == -2 ** 31 and b == -1:
+                raise VMError(ERR_OVERFLOW)
+            if b == 0:
+                raise VMError(ERR_DIV_BY_ZERO)
+            q = abs(a) // abs(b)
+            if (a < 0) != (b < 0):
+                q = -q
+            self.set_sv(operand, V_I32, bits_of_i32(a - q * b))
+        elif opcode == OP["OP_NEG_I32"]:
+            a = self.req_i32(imm[0])
+            self.set_sv(operand, V_I32, bits_of_i32(-a))
+            if a == -2 ** 31:
+                raise VMError(ERR_OVERFLOW)
+
+        # Unsigned arithmetic
+        elif opcode == OP["OP_ADD_U32"]:
+            r = self.req_u32(imm[0]) + self.req_u32(imm[1])
+            self.set_sv(operand, V_U32, r & 0xFFFFFFFF)
+            if r > 0xFFFFFFFF:
+                raise VMError(ERR_OVERFLOW)
+        elif opcode == OP["OP_SUB_U32"]:
+            r = self.req_u32(imm[0]) - self.req_u32(imm[1])
+            self.set_sv(operand, V_U32, r & 0xFFFFFFFF)
+            if r < 0:
+                raise VMError(ERR_OVERFLOW)
+        elif opcode == OP["OP_MUL_U32"]:
+            r = self.req_u32(imm[0]) * self.req_u32(imm[1])
+            self.set_sv(operand, V_U32, r & 0xFFFFFFFF)
+            if r > 0xFFFFFFFF:
+                raise VMError(ERR_OVERFLOW)
+        elif opcode == OP["OP_DIV_U32"]:
+            a, b = self.req_u32(imm[0]), self.req_u32(imm[1])
+            if b == 0:
+                raise VMError(ERR_DIV_BY_ZERO)
+            self.set_sv(operand, V_U32, a // b)
+        elif opcode == OP["OP_MOD_U32"]:
+            a, b = self.req_u32(imm[0]), self.req_u32(imm[1])
+            if b == 0:
+                raise VMError(ERR_DIV_BY_ZERO)
+            self.set_sv(operand, V_U32, a % b)
+
+        # Float arithmetic
+        elif opcode == OP["OP_ADD_F32"]:
+            self.set_float_result(
+                operand, self.req_f32(imm[0]) + self.req_f32(imm[1]))
+        elif opcode == OP["OP_SUB_F32"]:
+            self.set_float_result(
+                operand, self.req_f32(imm[0]) - self.req_f32(imm[1]))
+        elif opcode == OP["OP_MUL_F32"]:
+            self.set_float_result(
+                operand, self.req_f32(imm[0]) * self.req_f32(imm[1]))
+        elif opcode == OP["OP_DIV_F32"]:
+            a, b = self.req_f32(imm[0]), self.req_f32(imm[1])
+            if b == 0.0:
+                raise VMError(ERR_DIV_BY_ZERO)
+            self.set_float_result(operand, a / b)
+        elif opcode == OP["OP_NEG_F32"]:
+            self.set_sv(operand, V_FLOAT, bits_of_f32(-self.req_f32(imm[0])))
+        elif opcode == OP["OP_ABS_F32"]:
+            self.set_sv(operand, V_FLOAT,
+                        bits_of_f32(abs(self.req_f32(imm[0]))))
+        elif opcode == OP["OP_SQRT_F32"]:
+            a = self.req_f32(imm[0])
+            if a < 0.0:
+                raise VMError(ERR_OVERFLOW)
+            self.set_float_result(operand, a ** 0.5)
+
+        # Bitwise
+        elif opcode == OP["OP_AND_U32"]:
+            self.set_sv(operand, V_U32,
+                        self.req_u32(imm[0]) & self.req_u32(imm[1]))
+        elif opcode == OP["OP_OR_U32"]:
+            self.set_sv(operand, V_U32,
+                        self.req_u32(imm[0]) | self.req_u32(imm[1]))
+        elif opcode == OP["OP_XOR_U32"]:
+            self.set_sv(operand, V_U32,
+                        self.req_u32(imm[0]) ^ self.req_u32(imm[1]))
+        elif opcode == OP["OP_NOT_U32"]:
+            self.set_sv(operand, V_U32, ~self.req_u32(imm[0]) & 0xFFFFFFFF)
+        elif opcode == OP["OP_SHL_U32"]:
+            a, b = self.req_u32(imm[0]), self.req_u32(imm[1])
+            if b >= 32:
+                raise VMError(ERR_BOUNDS)
+            self.set_sv(operand, V_U32, (a << b) & 0xFFFFFFFF)
+        elif opcode == OP["OP_SHR_U32"]:
+            a, b = self.req_u32(imm[0]), self.req_u32(imm[1])
+            if b >= 32:
+                raise VMError(ERR_BOUNDS)
+            self.set_sv(operand, V_U32, a >> b)
+
+        # Comparison
+        elif opcode == OP["OP_CMP_I32"]:
+            self._set_flags(self.req_i32(imm[0]), self.req_i32(imm[1]))
+        elif opcode == OP["OP_CMP_U32"]:
+            self._set_flags(self.req_u32(imm[0]), self.req_u32(imm[1]))
+        elif opcode == OP["OP_CMP_F32"]:
+            a, b = self.req_f32(imm[0]), self.req_f32(imm[1])
+            self.flags = 0
+            if abs(f32(a - b)) < 1e-6:  # epsilon equality, like the C VM
+                self.flags |= FLAG_ZERO
+            if a < b:
+                self.flags |= FLAG_LESS
+            if a > b:
+                self.flags |= FLAG_GREATER
+
+        # Fused compare-and-branch (normally produced by the C VM's
+        # load-time fusion, but legal in bytecode directly)
+        elif OP["OP_JEQ_I32"] <= opcode <= OP["OP_JGE_I32"]:
+            a = self.req_i32(operand & 0x0F)
+            b = self.req_i32((operand >> 4) & 0x0F)
+            taken = {
+                OP["OP_JEQ_I32"]: a == b, OP["OP_JNE_I32"]: a != b,
+                OP["OP_JLT_I32"]: a < b, OP["OP_JGT_I32"]: a > b,
+                OP["OP_JLE_I32"]: a <= b, OP["OP_JGE_I32"]: a >= b,
+            }[opcode]
+            if taken:
+                self.next_pc = imm[0]
+
+        # Fused load-and-add: the temp is written before the add
+        elif opcode == OP["OP_ADD_I32_IMM"]:
+            d, t = operand & 0x0F, (operand >> 4) & 0x0F
+            self.set_sv(t, V_I32, imm[1])
+            r = self.req_i32(imm[0]) + self.req_i32(t)
+            self.set_sv(d, V_I32, bits_of_i32(r))
+            if not -2 ** 31 <= r < 2 ** 31:
+                raise VMError(ERR_OVERFLOW)
+        elif opcode == OP["OP_LOAD_L_ADD_I32"]:
+            d, t = operand & 0x0F, (operand >> 4) & 0x0F
+            self.set_sv(t, frame.locals_types[imm[0]],
+                        frame.locals_vals[imm[0]])
+            r = self.req_i32(imm[1]) + self.req_i32(t)
+            self.set_sv(d, V_I32, bits_of_i32(r))
+            if not -2 ** 31 <= r < 2 ** 31:
+                raise VMError(ERR_OVERFLOW)
+
+        # Constant-divisor division via magic multiply
+        elif opcode == OP["OP_DIV_I32_CONST"]:
+            n = self.req_i32(imm[0])
+            magic = i32_of_bits(imm[1])
+            q = (magic * n) >> 32
+            adjust = htypes >> 5
+            if adjust == 1:
+                q += n
+            elif adjust == 2:
+                q -= n
+            q >>= htypes & 0x1F
+            q = i32_of_bits(bits_of_i32(q))
+            q += (bits_of_i32(q) >> 31)
+            self.set_sv(operand, V_I32, bits_of_i32(q))
+
+        # Branchless compare-to-boolean
+        elif opcode == OP["OP_SET_EQ_I32"]:
+            r = self.req_i32(imm[0]) == self.req_i32(imm[1])
+            self.set_sv(operand, V_U32, int(r))
+        elif opcode == OP["OP_SET_LT_I32"]:
+            r = self.req_i32(imm[0]) < self.req_i32(imm[1])
+            self.set_sv(operand, V_U32, int(r))
+
+        # Type conversions
+        elif opcode == OP["OP_I32_TO_U32"]:
+            self.set_sv(operand, V_U32, bits_of_i32(self.req_i32(imm[0])))
+        elif opcode == OP["OP_U32_TO_I32"]:
+            self.set_sv(operand, V_I32, self.req_u32(imm[0]))
+        elif opcode == OP["OP_I32_TO_F32"]:
+            self.set_sv(operand, V_FLOAT,
+                        bits_of_f32(f32(float(self.req_i32(imm[0])))))
+        elif opcode == OP["OP_U32_TO_F32"]:
+            self.set_sv(operand, V_FLOAT,
+                        bits_of_f32(f32(float(self.req_u32(imm[0])))))
+        elif opcode == OP["OP_F32_TO_I32"]:
+            a = self.req_f32(imm[0])
+            try:
+                v = int(a)
+            except (OverflowError, ValueError):
+                v = -2 ** 31
+            if not -2 ** 31 <= v < 2 ** 31:
+                v = -2 ** 31  # x86-64 cvttss2si result for out of range
+            self.set_sv(operand, V_I32, bits_of_i32(v))
+        elif opcode == OP["OP_F32_TO_U32"]:
+            a = self.req_f32(imm[0])
+            try:
+                v = int(a)
+            except (OverflowError, ValueError):
+                v = 0
+            self.set_sv(operand, V_U32, v & 0xFFFFFFFF)
+
+        # Buffers
+        elif opcode == OP["OP_BUF_READ"]:
+            buf = self.bufs[imm[0]]
+            pos = imm[1]
+            if buf.type == MB_VOID:
+                raise VMError(ERR_TYPE_MISMATCH)
+            if pos >= MB_CAPACITY[buf.type]:
+                raise VMError(ERR_INVALID_BUFFER_POS)
+            if buf.type == MB_U8:
+                self.set_sv(operand, V_U32, buf.data[pos])
+            elif buf.type == MB_U16:
+                self.set_sv(operand, V_U32,
+                            struct.unpack_from("<H", buf.data, pos * 2)[0])
+            elif buf.type == MB_I32:
+                self.set_sv(operand, V_I32,
+                            struct.unpack_from("<I", buf.data, pos * 4)[0])
+            elif buf.type == MB_U32:
+                self.set_sv(operand, V_U32,
+                            struct.unpack_from("<I", buf.data, pos * 4)[0])
+            else:
+                self.set_sv(operand, V_FLOAT,
+                            struct.unpack_from("<I", buf.data, pos * 4)[0])
+        elif opcode == OP["OP_BUF_WRITE"]:
+            buf = self.bufs[imm[0]]
+            pos = imm[1]
+            if buf.type == MB_VOID:
+                raise VMError(ERR_TYPE_MISMATCH)
+            if pos >= MB_CAPACITY[buf.type]:
+                raise VMError(ERR_INVALID_BUFFER_POS)
+            t, b = self.sv(operand)
+            if buf.type in (MB_U8, MB_U16):
+                if t not in (V_U32, V_I32):
+                    raise VMError(ERR_TYPE_MISMATCH)
+                if buf.type == MB_U8:
+                    buf.data[pos] = b & 0xFF
+                else:
+                    struct.pack_into("<H", buf.data, pos * 2, b & 0xFFFF)
+            elif buf.type == MB_I32:
+                if t != V_I32:
+                    raise VMError(ERR_TYPE_MISMATCH)
+                struct.pack_into("<I", buf.data, pos * 4, b)
+            elif buf.type == MB_U32:
+                if t != V_U32:
+                    raise VMError(ERR_TYPE_MISMATCH)
+                struct.pack_into("<I", buf.data, pos * 4, b)
+            else:
+                if t != V_FLOAT:
+                    raise VMError(ERR_TYPE_MISMATCH)
+                struct.pack_into("<I", buf.data, pos * 4, b)
+        elif opcode == OP["OP_BUF_LEN"]:
+            self.set_sv(operand, V_U32, MB_CAPACITY[self.bufs[imm[0]].type])
+        elif opcode == OP["OP_BUF_CLEAR"]:
+            self.bufs[imm[0]].data = bytearray(G_MEMBUF_LEN)
+
+        # Strings
+        elif opcode == OP["OP_STR_CAT"]:
+            dest, s1, s2 = (self.bufs[operand], self.bufs[imm[0]],
+                            self.bufs[imm[1]])
+            if s1.type != MB_U8 or s2.type != MB_U8:
+                raise VMError(ERR_TYPE_MISMATCH)
+            dest.type = MB_U8
+            cat = (s1.data[:s1.strlen()] +
+                   s2.data[:s2.strlen()])[:MEMBUF_U8_COUNT - 1]
+            dest.data[:len(cat)] = cat
+            dest.data[len(cat)] = 0
+        elif opcode == OP["OP_STR_COPY"]:
+            if operand != imm[0]:
+                dest, src = self.bufs[operand], self.bufs[imm[0]]
+                if src.type != MB_U8:
+                    raise VMError(ERR_TYPE_MISMATCH)
+                dest.type = MB_U8
+                n = src.strlen()
+                dest.data[:n] = src.data[:n]
+                dest.data[min(n, MEMBUF_U8_COUNT - 1)] = 0
+        elif opcode == OP["OP_STR_LEN"]:
+            buf = self.bufs[imm[0]]
+            if buf.type != MB_U8:
+                raise VMError(ERR_TYPE_MISMATCH)
+            self.set_sv(operand, V_U32, buf.strlen())
+        elif opcode == OP["OP_STR_CMP"]:
+            b1, b2 = self.bufs[imm[0]], self.bufs[imm[1]]
+            if b1.type != MB_U8 or b2.type != MB_U8:
+                raise VMError(ERR_TYPE_MISMATCH)
+            s1 = bytes(b1.data[:b1.strlen()])
+            s2 = bytes(b2.data[:b2.strlen()])
+            self._set_flags((s1 > s2) - (s1 < s2), 0)
+        elif opcode == OP["OP_STR_CHR"]:
+            buf = self.bufs[imm[0]]
+            if buf.type != MB_U8:
+                raise VMError(ERR_TYPE_MISMATCH)
+            self.set_sv(operand, V_U32, buf.data[imm[1]])
+        elif opcode == OP["OP_STR_SET_CHR"]:
+            buf = self.bufs[imm[0]]
+            if buf.type != MB_U8:
+                raise VMError(ERR_TYPE_MISMATCH)
+            buf.data[imm[1]] = imm[2] & 0xFF
+
+        # I/O
+        elif opcode == OP["OP_PRINT_I32"]:
+            self.out(str(self.req_i32(imm[0])))
+        elif opcode == OP["OP_PRINT_U32"]:
+            self.out(str(self.req_u32(imm[0])))
+        elif opcode == OP["OP_PRINT_F32"]:
+            self.print_f32(self.req_f32(imm[0]))
+        elif opcode == OP["OP_PRINT_STR"]:
+            buf = self.bufs[imm[0]]
+            if buf.type != MB_U8:
+                raise VMError(ERR_TYPE_MISMATCH)
+            self.out(buf.data[:buf.strlen()].decode("latin-1"))
+        elif opcode == OP["OP_PRINTLN"]:
+            self.out("\n")
+        elif opcode == OP["OP_READ_I32"]:
+            sys.stdout.flush()
+            v = self._read_number(signed=True)
+            if v is None:
+                v = 0
+                self._discard_line()
+            self.set_sv(operand, V_I32, bits_of_i32(v))
+        elif opcode == OP["OP_READ_U32"]:
+            sys.stdout.flush()
+            v = self._read_number(signed=False)
+            if v is None:
+                v = 0
+                self._discard_line()
+            self.set_sv(operand, V_U32, v)
+        elif opcode == OP["OP_READ_F32"]:
+            sys.stdout.flush()
+            v = self._read_number(signed=True, floating=True)
+            if v is None:
+                v = 0.0
+                self._discard_line()
+            self.set_sv(operand, V_FLOAT, bits_of_f32(v))
+        elif opcode == OP["OP_READ_STR"]:
+            sys.stdout.flush()
+            buf = self.bufs[imm[0]]
+            buf.type = MB_U8
+            i = 0
+            c = self._getchar()
+            while i < MEMBUF_U8_COUNT - 1 and c not in (None, "\n"):
+                buf.data[i] = ord(c) & 0xFF
+                i += 1
+                c = self._getchar()
+            buf.data[i] = 0
+            if i == MEMBUF_U8_COUNT - 1 and c not in (None, "\n"):
+                self._discard_line(limit=10 ** 9)
+
+        else:
+            raise VMError(ERR_INVALID_OPCODE)
+
+    def _set_flags(self, a, b):
+        self.flags = 0
+        if a == b:
+            self.flags |= FLAG_ZERO
+        if a < b:
+            self.flags |= FLAG_LESS
+        if a > b:
+            self.flags |= FLAG_GREATER
+
+
+def main(argv):
+    if len(argv) != 2:
+        sys.stderr.write("Usage: refvm.py <bytecode_file>\n")
+        return 1
+    data = Path(argv[1]).read_bytes()
+
+    # Banner matches vm-main.c so outputs diff cleanly
+    sys.stdout.write("Loaded %d bytes from '%s'\n" % (len(data), argv[1]))
+    try:
+        vm = RefVM(data)
+    except VMError as e:
+        sys.stderr.write("Error loading program: %s\n"
+                         % STATUS_NAMES[e.status])
+        return 1
+
+    sys.stdout.write("Executing...\n")
+    try:
+        vm.run()
+    except VMError as e:
+        if e.status == ERR_HALT:
+            sys.stdout.write("\nProgram completed successfully.\n")
+            return 0
+        sys.stdout.flush()
+        sys.stderr.write("\nProgram error at PC=0x%04X: %s\n"
+                         % (vm.pc & 0xFFFF, STATUS_NAMES[e.status]))
+        vm.dump_state(e.status)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))